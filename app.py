@@ -3,14 +3,15 @@ from datetime import date, timedelta
 
 # IMPORTING THE FUNCTIONS FROM THE TOOLS
 
-from flights import search_flights, format_flight
+from flights import search_flights, search_round_trips, format_flight
 from hotels import search_hotels, format_hotel
 from places import search_places, format_place
 from weather import get_weather_forecast
 from budget import (
     estimate_flight_budget,
     estimate_hotel_budget,
-    estimate_full_trip_budget
+    estimate_full_trip_budget,
+    estimate_round_trip_budget
 )
 
 # SESSION STATE
@@ -109,6 +110,7 @@ if st.session_state.page == "Plan a Full Trip":
 
     if st.session_state.selected_hotel:
         days = st.number_input("How many days should I create an itinerary for?", min_value=1, step=1)
+        include_return = st.checkbox("Include a return flight")
 
         if st.button("Generate Trip Plan"):
             places = search_places(destination)
@@ -145,12 +147,44 @@ if st.session_state.page == "Plan a Full Trip":
             else:
                 st.warning("Weather data not available.")
 
+            return_trip = None
+            if include_return:
+                st.subheader("Return Flight🛬")
+                if days < 2:
+                    st.warning("A return flight needs a trip of at least 2 days.")
+                else:
+                    trips = search_round_trips(
+                        source,
+                        destination,
+                        days,
+                        days,
+                        travel_date=st.session_state.selected_flight["departure_time"][:10],
+                        limit=None
+                    )
+                    for trip in trips:
+                        if trip["outbound"]["flight_id"] == st.session_state.selected_flight["flight_id"]:
+                            return_trip = trip
+                            break
+
+                    if return_trip:
+                        st.write(format_flight(return_trip["return"]))
+                    else:
+                        st.warning("No return flight available for this trip length.")
+
             st.subheader("Estimated Budget💸")
-            budget = estimate_full_trip_budget(
-                st.session_state.selected_flight,
-                st.session_state.selected_hotel,
-                days
-            )
+            if return_trip:
+                budget = estimate_round_trip_budget(
+                    st.session_state.selected_flight,
+                    return_trip["return"],
+                    st.session_state.selected_hotel,
+                    days
+                )
+            else:
+                budget = estimate_full_trip_budget(
+                    st.session_state.selected_flight,
+                    st.session_state.selected_hotel,
+                    days
+                )
 
             for k, v in budget.items():
                 st.write(f"*{k.replace('_',' ').title()}*: ₹{v}")
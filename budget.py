@@ -70,4 +70,24 @@ def estimate_full_trip_budget(flight, hotel, days):
         "hotel_cost": hotel_cost,
         "misc_cost": misc_cost,
         "total_budget": flight_cost + hotel_cost + misc_cost
+    }
+
+
+def estimate_round_trip_budget(outbound, return_flight, hotel, days):
+    """
+    Used for a full trip with a return flight
+    """
+    nights = max(1, days - 1)
+
+    outbound_cost = outbound["price"]
+    return_cost = return_flight["price"]
+    hotel_cost = hotel["price_per_night"] * nights
+    misc_cost = 1500 * days
+
+    return {
+        "outbound_flight_cost": outbound_cost,
+        "return_flight_cost": return_cost,
+        "hotel_cost": hotel_cost,
+        "misc_cost": misc_cost,
+        "total_budget": outbound_cost + return_cost + hotel_cost + misc_cost
     }
\ No newline at end of file
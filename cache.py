@@ -0,0 +1,215 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any,Optional
+
+# Configuration
+
+# Set this to a file path to turn the persistent cache on
+cache_path_env = "TRAVEL_PLANNER_CACHE"
+max_entries_env = "TRAVEL_PLANNER_CACHE_MAX_ENTRIES"
+
+default_max_entries = 10000
+
+# Hits only refresh last_used when it is older than this (seconds), so
+# readers rarely need SQLite's single write lock
+touch_interval = 60
+
+# The size limit is checked once every this many writes to the file
+# (counted in the file itself, so short-lived processes add up)
+default_evict_every = 100
+
+# Persistent result cache
+
+class ResultCache:
+    """
+    Key-value cache stored in an SQLite file
+    - values are stored as JSON
+    - entries can expire after a TTL (seconds)
+    - least recently used entries are evicted above max_entries
+      (checked when the cache opens and every evict_every writes to the
+      file, so it can briefly hold more)
+    The file can be shared by several worker processes.
+    """
+
+    def __init__(self, path: str, max_entries: int = default_max_entries,
+            evict_every: int = default_evict_every):
+        self.path = path
+        self.max_entries = max_entries
+        self.evict_every = evict_every
+        self.local = threading.local()
+
+        with self.connect() as conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS entries (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL,
+                    expires_at REAL,
+                    last_used REAL NOT NULL
+                )
+                """
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS entries_last_used ON entries (last_used)"
+            )
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS meta (
+                    key TEXT PRIMARY KEY,
+                    value INTEGER NOT NULL
+                )
+                """
+            )
+            conn.execute("INSERT OR IGNORE INTO meta (key, value) VALUES ('writes', 0)")
+            self.evict(conn)
+
+    def connect(self) -> sqlite3.Connection:
+        """
+        One connection per thread and process, WAL mode so readers never
+        block writers
+        """
+        conn = getattr(self.local, "conn", None)
+        # Connections must not be reused in a forked worker
+        if conn is None or self.local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self.local.conn = conn
+            self.local.pid = os.getpid()
+        return conn
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Return the cached value, or None if missing or expired
+        """
+        now = time.time()
+        conn = self.connect()
+
+        row = conn.execute(
+            "SELECT value, expires_at, last_used FROM entries WHERE key = ?", (key,)
+        ).fetchone()
+
+        if row is None:
+            return None
+
+        value, expires_at, last_used = row
+
+        if expires_at is not None and expires_at <= now:
+            with conn:
+                conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+            return None
+
+        # LRU order only needs to be roughly right
+        if now - last_used > touch_interval:
+            with conn:
+                conn.execute("UPDATE entries SET last_used = ? WHERE key = ?", (now, key))
+
+        return json.loads(value)
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        """
+        Store a JSON-serialisable value, evicting old entries if needed
+        """
+        now = time.time()
+        expires_at = now + ttl if ttl is not None else None
+        conn = self.connect()
+
+        with conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO entries (key, value, expires_at, last_used) VALUES (?, ?, ?, ?)",
+                (key, json.dumps(value), expires_at, now)
+            )
+
+            # Shared write counter, updated under the same write lock
+            conn.execute("UPDATE meta SET value = value + 1 WHERE key = 'writes'")
+            (writes,) = conn.execute("SELECT value FROM meta WHERE key = 'writes'").fetchone()
+
+            if writes % self.evict_every == 0:
+                self.evict(conn)
+
+    def evict(self, conn: sqlite3.Connection) -> None:
+        """
+        Delete least recently used entries above max_entries
+        Must run inside a transaction on conn
+        """
+        (count,) = conn.execute("SELECT COUNT(*) FROM entries").fetchone()
+        if count > self.max_entries:
+            conn.execute(
+                """
+                DELETE FROM entries WHERE key IN (
+                    SELECT key FROM entries ORDER BY last_used LIMIT ?
+                )
+                """,
+                (count - self.max_entries,)
+            )
+
+    def clear(self) -> None:
+        with self.connect() as conn:
+            conn.execute("DELETE FROM entries")
+
+# Key helpers
+
+def make_key(namespace: str, *parts) -> str:
+    """
+    Build a stable cache key from a namespace and normalised arguments
+    """
+    raw = json.dumps([namespace, parts], sort_keys=True, default=str)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def catalog_version(path: str) -> str:
+    """
+    Version of a data file, so cached results are dropped when it changes
+    """
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return "missing"
+    return f"{stat.st_mtime_ns}:{stat.st_size}"
+
+# Shared cache
+
+_cache = None
+_configured = False
+
+
+def set_cache(cache: Optional[ResultCache]) -> None:
+    """
+    Use the given cache for all tools (None turns caching off)
+    """
+    global _cache, _configured
+    _cache = cache
+    _configured = True
+
+
+def get_cache() -> Optional[ResultCache]:
+    """
+    Return the shared cache, created from the environment on first use
+    Returns None if caching is not configured
+    """
+    global _cache, _configured
+    if not _configured:
+        path = os.environ.get(cache_path_env)
+        if path:
+            max_entries = int(os.environ.get(max_entries_env, default_max_entries))
+            _cache = ResultCache(path, max_entries)
+        _configured = True
+    return _cache
+
+# Local test block
+
+if __name__ == "__main__":
+    cache = ResultCache("travel_cache.sqlite3", max_entries=2, evict_every=1)
+
+    cache.set(make_key("demo", "a"), [1, 2, 3])
+    cache.set(make_key("demo", "b"), {"x": 1}, ttl=60)
+    cache.set(make_key("demo", "c"), "latest")
+
+    # "a" is the least recently used entry, so it has been evicted
+    print(cache.get(make_key("demo", "a")))
+    print(cache.get(make_key("demo", "b")))
+    print(cache.get(make_key("demo", "c")))
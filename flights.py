@@ -1,7 +1,9 @@
-import json
 import os
-from datetime import datetime
+from collections import deque
 from typing import List,Dict,Optional
+from cache import get_cache, make_key, catalog_version
+from storage import get_backend
+from ingest import load_dataset, normalize_flight, RECORD_SCHEMA_VERSION
 
 # Path handling
 
@@ -10,71 +12,247 @@ data_path = os.path.join(base_dir,'data','flights.json')
 
 # Core data loader
 
+def load_flight_rows() -> List[Dict]:
+    """
+    Load validated flight rows from flights.json
+    Bad records are quarantined by the ingest pipeline
+    """
+    return load_dataset(data_path, normalize_flight)
+
+
 def load_flights() -> List[Dict]:
     """
-    Load flight data from flights.json
+    Load validated flight data from flights.json
     """
-    if not os.path.exists(data_path):
-        raise FileNotFoundError(f'flights.json not found at {data_path}')
-    
-    with open(data_path,'r',encoding='utf-8')as file:
-        return json.load(file)
+    return [row["record"] for row in load_flight_rows()]
     
+# Flight duration helper
+
+def flight_duration(row: Dict) -> float:
+    """
+    Duration of a flight row in seconds (computed at ingest)
+    """
+    return row["duration"]
+
 # Flight search logic
 
 def search_flights(source_city: str,
         destination_city: str,
         travel_date: Optional[str] = None,
-        sort_by: str = 'price') -> List[Dict]:
+        sort_by: str = 'price',
+        limit: Optional[int] = None) -> List[Dict]:
     """
     Search flights by source and destination
     Parameters:
     - source_city (str)
     - destination_city (str)
     - travel_date (yyyy-mm-dd) [optional]
-    - sort_by: 'price'
+    - sort_by: 'price' or 'duration'
+    - limit (int) [optional]: maximum number of flights
     Returns:
-    - a list of matching flight dictionaries
+    - a list of matching flight dictionaries (shared with the loaded
+      catalog, so do not modify them)
     """
+    if not source_city or not destination_city:
+        raise ValueError("source_city and destination_city are required")
+
+    if limit is not None and limit < 1:
+        raise ValueError("limit must be at least 1")
+
+    source = source_city.strip().lower()
+    destination = destination_city.strip().lower()
+    backend = get_backend()
+
+    # Cached results
+
+    cache = get_cache()
+    if cache:
+        key = make_key(
+            "search_flights",
+            RECORD_SCHEMA_VERSION,
+            backend.version() if backend else catalog_version(data_path),
+            source,
+            destination,
+            travel_date,
+            sort_by,
+            limit
+        )
+        cached = cache.get(key)
+        if cached is not None:
+            return cached
+
+    # Alternate storage backend
+
+    if backend:
+        results = backend.search_flights(source, destination, travel_date, sort_by, limit)
+        if cache:
+            cache.set(key, results)
+        return results
+
     # Load flight data
 
-    flights = load_flights()
+    rows = load_flight_rows()
 
     # Filter by cities
-      
-    if not source_city or not destination_city:
-        raise ValueError("source_city and destination_city are required")
 
     results = []
-    for flight in flights:
-        if (flight["from"].strip().lower() == source_city.strip().lower()
-            and flight["to"].strip().lower() == destination_city.strip().lower()):
-            results.append(flight)
+    for row in rows:
+        if row["from_key"] == source and row["to_key"] == destination:
+            results.append(row)
     
     # Optional: filter by date
 
     if travel_date:
         results = [
-            flight for flight in results
-            if flight["departure_time"].startswith(travel_date)
+            row for row in results
+            if row["record"]["departure_time"].startswith(travel_date)
         ]
 
     # Sort results
 
     if sort_by == "price":
-        results.sort(key=lambda x: x["price"])
+        results.sort(key=lambda x: x["record"]["price"])
 
     elif sort_by == "duration":
-        def duration(t):
-            dep = datetime.fromisoformat(t["departure_time"])
-            arr = datetime.fromisoformat(t["arrival_time"])
-            return (arr - dep).total_seconds()
-        results.sort(key=duration)
+        results.sort(key=flight_duration)
     
     else:
         raise ValueError(f"Invalid sort_by value: {sort_by}. Expected 'price' or 'duration'.")
+
+    if limit:
+        results = results[:limit]
+
+    results = [row["record"] for row in results]
+
+    if cache:
+        cache.set(key, results)
+
     return results
 
+# Round-trip search logic
+
+def route_rows(source: str, destination: str, travel_date: Optional[str] = None) -> List[Dict]:
+    """
+    Flight rows on one route sorted by departure time
+    Cities must already be normalised (stripped and lower-cased)
+    """
+    backend = get_backend()
+    if backend:
+        return backend.route_flights(source, destination, travel_date)
+
+    rows = [
+        row for row in load_flight_rows()
+        if row["from_key"] == source and row["to_key"] == destination
+    ]
+
+    if travel_date:
+        rows = [row for row in rows if row["record"]["departure_time"].startswith(travel_date)]
+
+    rows.sort(key=lambda x: x["record"]["departure_time"])
+    return rows
+
+
+def pair_round_trips(
+        outbound_flights: List[Dict],
+        return_flights: List[Dict],
+        min_days: int,
+        max_days: int
+    ) -> List[Dict]:
+    """
+    Pair every outbound flight with the cheapest return flight that leaves
+    between min_days and max_days later (both travel days counted)
+    Both lists hold flight rows sorted by departure time
+    Returns:
+    - a list of {"outbound", "return", "days", "price"} dictionaries
+    """
+    if min_days < 2:
+        raise ValueError("A round trip spans at least 2 days")
+
+    if min_days > max_days:
+        raise ValueError("min_days cannot be greater than max_days")
+
+    # Both lists are walked once. The deque holds the returns inside the
+    # current trip-length window with increasing prices, so its first
+    # valid entry is the cheapest return for the outbound flight.
+
+    returns = [row["record"] for row in return_flights]
+    window = deque()
+    next_return = 0
+    pairs = []
+
+    for row in outbound_flights:
+        outbound = row["record"]
+        earliest = row["departure_day"] + min_days - 1
+        latest = row["departure_day"] + max_days - 1
+
+        while next_return < len(returns) and return_flights[next_return]["departure_day"] <= latest:
+            price = returns[next_return]["price"]
+            while window and returns[window[-1]]["price"] >= price:
+                window.pop()
+            window.append(next_return)
+            next_return += 1
+
+        while window and return_flights[window[0]]["departure_day"] < earliest:
+            window.popleft()
+
+        # An overnight outbound can land after an early return leaves
+        for i in window:
+            if returns[i]["departure_time"] >= outbound["arrival_time"]:
+                return_flight = returns[i]
+                pairs.append({
+                    "outbound": outbound,
+                    "return": return_flight,
+                    "days": return_flights[i]["departure_day"] - row["departure_day"] + 1,
+                    "price": outbound["price"] + return_flight["price"]
+                })
+                break
+
+    return pairs
+
+
+def search_round_trips(
+        source_city: str,
+        destination_city: str,
+        min_days: int,
+        max_days: int,
+        travel_date: Optional[str] = None,
+        return_from_city: Optional[str] = None,
+        return_to_city: Optional[str] = None,
+        limit: Optional[int] = 10
+    ) -> List[Dict]:
+    """
+    Search round-trip and open-jaw flight pairs
+    Parameters:
+    - source_city (str)
+    - destination_city (str)
+    - min_days, max_days (int): trip length window, both travel days counted
+    - travel_date (yyyy-mm-dd) [optional]: outbound date
+    - return_from_city (str) [optional]: defaults to destination_city
+    - return_to_city (str) [optional]: defaults to source_city
+    - limit (int) [optional]: number of pairs to return
+    Returns:
+    - a list of {"outbound", "return", "days", "price"} dictionaries,
+      cheapest first
+    """
+    if not source_city or not destination_city:
+        raise ValueError("source_city and destination_city are required")
+
+    if limit is not None and limit < 1:
+        raise ValueError("limit must be at least 1")
+
+    source = source_city.strip().lower()
+    destination = destination_city.strip().lower()
+    return_from = return_from_city.strip().lower() if return_from_city else destination
+    return_to = return_to_city.strip().lower() if return_to_city else source
+
+    outbound_flights = route_rows(source, destination, travel_date)
+    return_flights = route_rows(return_from, return_to)
+
+    pairs = pair_round_trips(outbound_flights, return_flights, min_days, max_days)
+    pairs.sort(key=lambda x: x["price"])
+
+    return pairs[:limit] if limit else pairs
+
 # Helper (for UI use later)
 
 def format_flight(flight: Dict) -> str:
@@ -89,6 +267,17 @@ def format_flight(flight: Dict) -> str:
         f"Arr: {flight['arrival_time']}"
     )
 
+
+def format_round_trip(trip: Dict) -> str:
+    """
+    Convert a round-trip dictionary into readable string
+    """
+    return (
+        f"Out: {format_flight(trip['outbound'])}\n"
+        f"Return: {format_flight(trip['return'])}\n"
+        f"{trip['days']} days | Flights total: ₹{trip['price']}"
+    )
+
 # Local test block
 
 if __name__ == "__main__":
@@ -1,6 +1,8 @@
-import json
 import os
 from typing import List,Dict,Optional
+from cache import get_cache, make_key, catalog_version
+from storage import get_backend
+from ingest import load_dataset, normalize_hotel, RECORD_SCHEMA_VERSION
 
 # Path handling
 
@@ -9,15 +11,19 @@ data_path = os.path.join(base_dir,'data','hotels.json')
 
 # Core data loader
 
+def load_hotel_rows() -> List[Dict]:
+    """
+    Load validated hotel rows from hotels.json
+    Bad records are quarantined by the ingest pipeline
+    """
+    return load_dataset(data_path, normalize_hotel)
+
+
 def load_hotels() -> List[Dict]:
     """
-    Load hotel data from hotels.json
+    Load validated hotel data from hotels.json
     """
-    if not os.path.exists(data_path):
-        raise FileNotFoundError(f'hotels.json not found at {data_path}')
-    
-    with open(data_path,'r',encoding='utf-8')as file:
-        return json.load(file)
+    return [row['record'] for row in load_hotel_rows()]
     
 # Hotel search logic
 
@@ -25,7 +31,8 @@ def search_hotels(
         city: str,
         name: Optional[str] = None,
         star: Optional[int] = None,
-        sort_by: str = 'price'
+        sort_by: str = 'price',
+        limit: Optional[int] = None
     ) -> List[Dict]:
     """
     Search hotels using parameters like:
@@ -33,48 +40,81 @@ def search_hotels(
     - name (str) [optional]
     - star (int) [optional]
     - sort_by: 'price per night'
+    - limit (int) [optional]
     Returns:
-    - a list of matching hotel dictionaries
+    - a list of matching hotel dictionaries (shared with the loaded
+      catalog, so do not modify them)
     """
-    # Load hotel data
-
-    hotels = load_hotels()
-
     # Normalise inputs
 
     city = city.strip().lower()
     name = name.strip().lower() if name else None
 
-    # Filter hotels
-
     if not city:
         raise ValueError('city is required')
 
+    if limit is not None and limit < 1:
+        raise ValueError('limit must be at least 1')
+
+    backend = get_backend()
+
+    # Cached results
+
+    cache = get_cache()
+    if cache:
+        version = backend.version() if backend else catalog_version(data_path)
+        key = make_key('search_hotels', RECORD_SCHEMA_VERSION, version, city, name, star, sort_by, limit)
+        cached = cache.get(key)
+        if cached is not None:
+            return cached
+
+    # Alternate storage backend
+
+    if backend:
+        results = backend.search_hotels(city, name, star, sort_by, limit)
+        if cache:
+            cache.set(key, results)
+        return results
+
+    # Load hotel data
+
+    rows = load_hotel_rows()
+
+    # Filter hotels
+
     results = []
-    for hotel in hotels:
+    for row in rows:
         
-        if hotel['city'].strip().lower() != city:
+        if row['city_key'] != city:
             continue
 
-        if name and name not in hotel['name'].strip().lower():
+        if name and name not in row['name_key']:
             continue
 
-        if star is not None and hotel['stars'] != star:
+        if star is not None and row['record']['stars'] != star:
             continue
 
-        results.append(hotel)
+        results.append(row)
     
     # Sorting logic
 
     if sort_by == 'price':
-        results.sort(key=lambda x:x['price_per_night'])
+        results.sort(key=lambda x:x['record']['price_per_night'])
 
     elif sort_by == 'stars':
-        results.sort(key=lambda x:x['stars'],reverse=True)
+        results.sort(key=lambda x:x['record']['stars'],reverse=True)
 
     else:
         raise ValueError(f'invalid sort_by value {sort_by}. Expected "price_per_night" or "stars".')
-    
+
+    if limit:
+        results = results[:limit]
+
+    results = [row['record'] for row in results]
+
+    if cache:
+        cache.set(key, results)
+
     return results
     
 # Helper (for UI use later)
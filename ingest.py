@@ -0,0 +1,287 @@
+import json
+import logging
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from functools import partial
+from typing import Callable,List,Dict,Tuple
+from cache import catalog_version
+
+logger = logging.getLogger(__name__)
+
+# Bump whenever the row shape changes, so cached results and SQLite
+# catalogs built with the old shape are not reused
+RECORD_SCHEMA_VERSION = 2
+
+# Record schemas (field -> accepted types)
+
+number = (int, float)
+
+FLIGHT_SCHEMA = {
+    "flight_id": str,
+    "airline": str,
+    "from": str,
+    "to": str,
+    "departure_time": str,
+    "arrival_time": str,
+    "price": number
+}
+
+HOTEL_SCHEMA = {
+    "hotel_id": str,
+    "name": str,
+    "city": str,
+    "stars": int,
+    "price_per_night": number,
+    "amenities": list
+}
+
+PLACE_SCHEMA = {
+    "place_id": str,
+    "name": str,
+    "city": str,
+    "type": str,
+    "rating": number
+}
+
+# Validation helpers
+
+def check_schema(record: Dict, schema: Dict) -> None:
+    """
+    Raise ValueError if a field is missing or has the wrong type
+    """
+    if not isinstance(record, dict):
+        raise ValueError("record is not an object")
+
+    for field, types in schema.items():
+        if field not in record:
+            raise ValueError(f"missing field '{field}'")
+
+        value = record[field]
+        # bool is an int subclass, but never a valid number here
+        if isinstance(value, bool) or not isinstance(value, types):
+            raise ValueError(f"field '{field}' has invalid type {type(value).__name__}")
+
+        if isinstance(value, str) and not value.strip():
+            raise ValueError(f"field '{field}' is empty")
+
+        # json.load accepts NaN and Infinity, which break sorting and budgets
+        if isinstance(value, float) and not math.isfinite(value):
+            raise ValueError(f"field '{field}' is not a finite number")
+
+# Record normalisers
+# Each returns a row: the original record under "record", plus lookup
+# keys and parsed values the tools filter and sort on. Searches return
+# row["record"], so results never need the extra fields stripped.
+
+def normalize_flight(record: Dict) -> Dict:
+    check_schema(record, FLIGHT_SCHEMA)
+
+    try:
+        departure = datetime.fromisoformat(record["departure_time"])
+        arrival = datetime.fromisoformat(record["arrival_time"])
+        # Timestamps are local times and are ordered as plain ISO strings
+        # (round-trip pairing, SQLite ORDER BY), so offsets are not allowed
+        if departure.tzinfo is not None or arrival.tzinfo is not None:
+            raise ValueError("timestamps must not include a timezone offset")
+    except ValueError as e:
+        raise ValueError(f"invalid departure_time/arrival_time: {e}")
+
+    if arrival < departure:
+        raise ValueError("arrival_time is before departure_time")
+
+    if record["price"] < 0:
+        raise ValueError("price cannot be negative")
+
+    return {
+        "record": record,
+        "from_key": record["from"].strip().lower(),
+        "to_key": record["to"].strip().lower(),
+        "departure_day": departure.toordinal(),
+        "duration": (arrival - departure).total_seconds()
+    }
+
+
+def normalize_hotel(record: Dict) -> Dict:
+    check_schema(record, HOTEL_SCHEMA)
+
+    if not 1 <= record["stars"] <= 5:
+        raise ValueError("stars must be between 1 and 5")
+
+    if record["price_per_night"] < 0:
+        raise ValueError("price_per_night cannot be negative")
+
+    if not all(isinstance(a, str) for a in record["amenities"]):
+        raise ValueError("amenities must be a list of strings")
+
+    return {
+        "record": record,
+        "city_key": record["city"].strip().lower(),
+        "name_key": record["name"].strip().lower()
+    }
+
+
+def normalize_place(record: Dict) -> Dict:
+    check_schema(record, PLACE_SCHEMA)
+
+    if not 0 <= record["rating"] <= 5:
+        raise ValueError("rating must be between 0 and 5")
+
+    return {
+        "record": record,
+        "city_key": record["city"].strip().lower(),
+        "type_key": record["type"].strip().lower(),
+        "name_key": record["name"].strip().lower()
+    }
+
+# Ingest pipeline
+
+def validate_chunk(
+        normalize: Callable,
+        start: int,
+        records: List,
+        keep_records: bool = True
+    ) -> Tuple[List[Dict], List[Dict]]:
+    """
+    Normalise one chunk, collecting bad rows instead of raising
+    With keep_records=False the valid rows leave out "record", so a worker
+    process only sends back the fields it computed.
+    """
+    valid = []
+    quarantined = []
+
+    for offset, record in enumerate(records):
+        try:
+            row = normalize(record)
+        except (ValueError, TypeError, KeyError) as e:
+            quarantined.append({
+                "index": start + offset,
+                "error": str(e),
+                "record": record
+            })
+            continue
+
+        if not keep_records:
+            del row["record"]
+        valid.append(row)
+
+    return valid, quarantined
+
+
+def ingest_records(
+        records: List,
+        normalize: Callable,
+        workers: int = 1,
+        chunk_size: int = 50000
+    ) -> Tuple[List[Dict], List[Dict]]:
+    """
+    Validate and normalise records, in parallel chunks if workers > 1
+    Returns:
+    - the rows of the valid records, in their original order
+    - the quarantined rows as {"index", "error", "record"} dictionaries
+    """
+    starts = range(0, len(records), chunk_size)
+    chunks = [records[i:i + chunk_size] for i in starts]
+
+    parallel = workers > 1 and len(chunks) > 1
+
+    if parallel:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(partial(validate_chunk, normalize, keep_records=False), starts, chunks))
+    else:
+        results = [validate_chunk(normalize, i, chunk) for i, chunk in zip(starts, chunks)]
+
+    valid = []
+    quarantined = []
+    for start, (chunk_valid, chunk_quarantined) in zip(starts, results):
+        if parallel:
+            # Attach this process's records to the rows the worker sent back
+            bad = {row["index"] for row in chunk_quarantined}
+            end = min(start + chunk_size, len(records))
+            indexes = (i for i in range(start, end) if i not in bad)
+            for i, row in zip(indexes, chunk_valid):
+                row["record"] = records[i]
+
+        valid.extend(chunk_valid)
+        quarantined.extend(chunk_quarantined)
+
+    return valid, quarantined
+
+
+def ingest_file(path: str, normalize: Callable, workers: int = 1) -> Tuple[List[Dict], List[Dict]]:
+    """
+    Load a JSON dataset and run it through the ingest pipeline
+    """
+    if not os.path.exists(path):
+        raise FileNotFoundError(f'{os.path.basename(path)} not found at {path}')
+
+    with open(path,'r',encoding='utf-8')as file:
+        records = json.load(file)
+
+    if not isinstance(records, list):
+        raise ValueError(f"{path} must contain a list of records")
+
+    valid, quarantined = ingest_records(records, normalize, workers)
+
+    if quarantined:
+        logger.warning(
+            "Quarantined %d of %d records from %s (first: row %d, %s)",
+            len(quarantined), len(records), path,
+            quarantined[0]["index"], quarantined[0]["error"]
+        )
+
+    return valid, quarantined
+
+# Cached datasets
+
+_datasets = {}
+
+
+def load_dataset(path: str, normalize: Callable) -> List[Dict]:
+    """
+    Return the rows of a dataset's valid records, re-ingesting only when the file changes
+    """
+    if not os.path.exists(path):
+        raise FileNotFoundError(f'{os.path.basename(path)} not found at {path}')
+
+    version = catalog_version(path)
+    cached = _datasets.get(path)
+
+    if cached is None or cached[0] != version:
+        valid, quarantined = ingest_file(path, normalize)
+        cached = (version, valid, quarantined)
+        _datasets[path] = cached
+
+    return list(cached[1])
+
+
+def quarantine_report(path: str) -> List[Dict]:
+    """
+    Rows rejected the last time a dataset was loaded
+    """
+    cached = _datasets.get(path)
+    return list(cached[2]) if cached else []
+
+# Local test block
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Validate the travel planner datasets")
+    parser.add_argument("paths", nargs="+", help="flights.json, hotels.json and/or places.json")
+    parser.add_argument("--workers", type=int, default=1, help="validate in parallel chunks with this many processes")
+    args = parser.parse_args()
+
+    datasets = {
+        "flights.json": normalize_flight,
+        "hotels.json": normalize_hotel,
+        "places.json": normalize_place
+    }
+
+    for path in args.paths:
+        valid, quarantined = ingest_file(path, datasets[os.path.basename(path)], args.workers)
+        print(f"{path}: {len(valid)} valid, {len(quarantined)} quarantined")
+
+        for row in quarantined:
+            print(f"- row {row['index']}: {row['error']}")
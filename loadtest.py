@@ -0,0 +1,362 @@
+import argparse
+import json
+import random
+import threading
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import date, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List,Dict,Optional
+from urllib.parse import urlparse, parse_qs
+
+import weather
+from flights import load_flights, search_flights
+from hotels import search_hotels
+from places import search_places
+from weather import get_weather_forecast
+from budget import (
+    estimate_flight_budget,
+    estimate_hotel_budget,
+    estimate_full_trip_budget
+)
+
+# Local Open-Meteo stub
+
+class OpenMeteoHandler(BaseHTTPRequestHandler):
+    """
+    Answers /v1/forecast with made-up daily maximum temperatures
+    """
+
+    def do_GET(self):
+        query = parse_qs(urlparse(self.path).query)
+        start = date.fromisoformat(query["start_date"][0])
+        end = date.fromisoformat(query["end_date"][0])
+
+        days = [start + timedelta(days=i) for i in range((end - start).days + 1)]
+        body = json.dumps({
+            "daily": {
+                "time": [d.isoformat() for d in days],
+                "temperature_2m_max": [round(25 + 5 * random.random(), 1) for _ in days]
+            }
+        }).encode("utf-8")
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_weather_stub() -> ThreadingHTTPServer:
+    """
+    Start the stub on a free local port in a background thread
+    """
+    server = ThreadingHTTPServer(("127.0.0.1", 0), OpenMeteoHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+# Planning sessions (same steps as the pages in app.py)
+
+def find_flights(source: str, destination: str, travel_date: Optional[str]) -> List[Dict]:
+    """
+    Flight search with the app's fallback to all dates when the chosen date has none
+    """
+    flights = search_flights(source, destination, travel_date)
+    if not flights and travel_date:
+        flights = search_flights(source, destination, None)
+    return flights
+
+
+def full_trip_session(source: str, destination: str, travel_date: Optional[str], days: int) -> None:
+    flights = find_flights(source, destination, travel_date)
+    if not flights:
+        return
+    flight = flights[0]
+
+    hotels = search_hotels(destination)
+    if not hotels:
+        return
+    hotel = hotels[0]
+
+    search_places(destination)
+
+    flight_date = date.fromisoformat(flight["departure_time"][:10])
+    get_weather_forecast(destination, flight_date, flight_date + timedelta(days=days))
+    estimate_full_trip_budget(flight, hotel, days)
+
+
+def flights_session(source: str, destination: str, travel_date: Optional[str], days: int) -> None:
+    flights = find_flights(source, destination, travel_date)
+    if flights:
+        estimate_flight_budget(flights[0])
+
+
+def hotels_session(source: str, destination: str, travel_date: Optional[str], days: int) -> None:
+    hotels = search_hotels(destination)
+    if hotels:
+        search_places(destination)
+        estimate_hotel_budget(hotels[0], days)
+
+
+def places_session(source: str, destination: str, travel_date: Optional[str], days: int) -> None:
+    search_places(destination)
+
+
+SESSIONS = {
+    "full": full_trip_session,
+    "flights": flights_session,
+    "hotels": hotels_session,
+    "places": places_session
+}
+
+# Worker side
+
+_trace_memory = False
+
+
+def init_worker(weather_url: Optional[str], trace_memory: bool) -> None:
+    global _trace_memory
+    if weather_url:
+        weather.OPEN_METEO_URL = weather_url
+    _trace_memory = trace_memory
+    if trace_memory:
+        tracemalloc.start()
+
+
+def run_session(kind: str, source: str, destination: str, travel_date: Optional[str], days: int) -> Dict:
+    """
+    Run one session and measure wall time, CPU time and peak allocations
+    CPU time is per thread, so it stays per session in thread mode too.
+    Peak allocations are only tracked per session in process mode.
+    """
+    if _trace_memory:
+        tracemalloc.reset_peak()
+        base, _ = tracemalloc.get_traced_memory()
+
+    cpu_start = time.thread_time()
+    wall_start = time.perf_counter()
+    error = None
+
+    try:
+        SESSIONS[kind](source, destination, travel_date, days)
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+
+    latency = time.perf_counter() - wall_start
+    cpu = time.thread_time() - cpu_start
+    memory = None
+    if _trace_memory:
+        _, peak = tracemalloc.get_traced_memory()
+        memory = peak - base
+
+    return {
+        "kind": kind,
+        "latency": latency,
+        "cpu": cpu,
+        "memory": memory,
+        "error": error
+    }
+
+# Reporting
+
+def parse_mix(mix: str) -> Dict[str, float]:
+    """
+    Parse a session mix like 'full=6,flights=2,hotels=1,places=1'
+    """
+    weights = {}
+    for part in mix.split(","):
+        kind, _, weight = part.partition("=")
+        kind = kind.strip()
+        if kind not in SESSIONS:
+            raise ValueError(f"Unknown session kind: {kind}. Expected one of {', '.join(SESSIONS)}.")
+        weights[kind] = float(weight) if weight else 1.0
+    return weights
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """
+    Nearest-rank percentile of a sorted list
+    """
+    if not values:
+        return 0.0
+    rank = max(1, -(-len(values) * pct // 100))
+    return values[int(rank) - 1]
+
+
+def summarise(results: List[Dict], total: int) -> Dict:
+    latencies = sorted(r["latency"] for r in results)
+    memory = [r["memory"] for r in results if r["memory"] is not None]
+
+    return {
+        "sessions": len(results),
+        "share_pct": len(results) / total * 100 if total else 0.0,
+        "errors": sum(1 for r in results if r["error"]),
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p95_ms": percentile(latencies, 95) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "cpu_ms": sum(r["cpu"] for r in results) / len(results) * 1000 if results else 0.0,
+        "memory_kb": sum(memory) / len(memory) / 1024 if memory else None
+    }
+
+
+def format_summary(name: str, summary: Dict) -> str:
+    memory = f"{summary['memory_kb']:.1f} KB" if summary["memory_kb"] is not None else "n/a"
+    if "throughput" in summary:
+        volume = f"{summary['throughput']:.1f}/s"
+    else:
+        volume = f"{summary['share_pct']:.0f}% of sessions"
+
+    return (
+        f"{name} | "
+        f"{summary['sessions']} sessions | "
+        f"{volume} | "
+        f"{summary['errors']} errors | "
+        f"p50 {summary['p50_ms']:.1f} ms | "
+        f"p95 {summary['p95_ms']:.1f} ms | "
+        f"p99 {summary['p99_ms']:.1f} ms | "
+        f"CPU {summary['cpu_ms']:.1f} ms | "
+        f"Mem {memory}"
+    )
+
+# Load test driver
+
+def make_plan(sessions: int, weights: Dict[str, float], max_days: int, rng: random.Random) -> List[tuple]:
+    """
+    Random sessions over the catalog routes
+    A third of them search without a date, a third pick a date with
+    flights and a third pick a random date that usually needs the fallback.
+    """
+    route_dates = {}
+    for flight in load_flights():
+        route = (flight["from"], flight["to"])
+        route_dates.setdefault(route, []).append(flight["departure_time"][:10])
+    routes = sorted(route_dates)
+
+    plan = []
+    for kind in rng.choices(list(weights), weights=list(weights.values()), k=sessions):
+        source, destination = rng.choice(routes)
+
+        pick = rng.randrange(3)
+        if pick == 0:
+            travel_date = None
+        elif pick == 1:
+            travel_date = rng.choice(route_dates[(source, destination)])
+        else:
+            travel_date = (date(2025, 1, 1) + timedelta(days=rng.randrange(365))).isoformat()
+
+        plan.append((kind, source, destination, travel_date, rng.randint(1, max_days)))
+
+    return plan
+
+
+def run_load_test(
+        sessions: int = 200,
+        concurrency: int = 4,
+        mix: str = "full=6,flights=2,hotels=1,places=1",
+        max_days: int = 5,
+        mode: str = "threads",
+        live_weather: bool = False,
+        trace_memory: bool = True,
+        seed: Optional[int] = None
+    ) -> Dict[str, Dict]:
+    """
+    Run planning sessions concurrently
+    - mode 'threads' runs them as threads in one process, like Streamlit
+      does, so results include GIL contention (use this for sizing)
+    - mode 'processes' runs them in worker processes
+    In thread mode memory is the run's peak allocations divided by the
+    concurrency, since allocations cannot be split between threads.
+    Returns:
+    - a summary per session kind plus an "all" summary
+    """
+    if sessions < 1:
+        raise ValueError("sessions must be at least 1")
+
+    if mode not in ("threads", "processes"):
+        raise ValueError(f"Invalid mode: {mode}. Expected 'threads' or 'processes'.")
+
+    weights = parse_mix(mix)
+    plan = make_plan(sessions, weights, max_days, random.Random(seed))
+
+    stub = None if live_weather else start_weather_stub()
+    weather_url = None if stub is None else f"http://127.0.0.1:{stub.server_port}/v1/forecast"
+    run_peak = None
+    # Thread mode points this process at the stub, so put the endpoint back after
+    weather_url_before = weather.OPEN_METEO_URL
+
+    try:
+        if mode == "processes":
+            pool = ProcessPoolExecutor(
+                max_workers=concurrency,
+                initializer=init_worker,
+                initargs=(weather_url, trace_memory)
+            )
+        else:
+            init_worker(weather_url, False)
+            pool = ThreadPoolExecutor(max_workers=concurrency)
+
+        with pool:
+            # Warm every worker up before timing
+            list(pool.map(run_session, *zip(*plan[:concurrency])))
+
+            if mode == "threads" and trace_memory:
+                tracemalloc.start()
+                base, _ = tracemalloc.get_traced_memory()
+
+            start = time.perf_counter()
+            results = list(pool.map(run_session, *zip(*plan)))
+            elapsed = time.perf_counter() - start
+
+            if mode == "threads" and trace_memory:
+                _, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+                run_peak = (peak - base) / concurrency / 1024
+    finally:
+        weather.OPEN_METEO_URL = weather_url_before
+        if stub:
+            stub.shutdown()
+
+    report = {"all": summarise(results, len(results))}
+    report["all"]["throughput"] = len(results) / elapsed if elapsed else 0.0
+    for kind in weights:
+        report[kind] = summarise([r for r in results if r["kind"] == kind], len(results))
+
+    if run_peak is not None:
+        report["all"]["memory_kb"] = run_peak
+
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load test the travel planner tools")
+    parser.add_argument("--sessions", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--mix", default="full=6,flights=2,hotels=1,places=1")
+    parser.add_argument("--max-days", type=int, default=5)
+    parser.add_argument("--mode", choices=["threads", "processes"], default="threads", help="threads matches how Streamlit serves sessions")
+    parser.add_argument("--live-weather", action="store_true", help="call the real Open-Meteo API instead of the local stub")
+    parser.add_argument("--no-memory", action="store_true", help="skip tracemalloc, which slows sessions down")
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = parser.parse_args()
+
+    report = run_load_test(
+        sessions=args.sessions,
+        concurrency=args.concurrency,
+        mix=args.mix,
+        max_days=args.max_days,
+        mode=args.mode,
+        live_weather=args.live_weather,
+        trace_memory=not args.no_memory,
+        seed=args.seed
+    )
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        for name, summary in report.items():
+            print(format_summary(name, summary))
@@ -0,0 +1,168 @@
+from typing import List,Dict,Optional
+from flights import route_rows, format_flight, flight_duration
+from hotels import search_hotels, format_hotel
+from budget import parse_date, estimate_full_trip_budget
+
+# Pruning helpers
+
+def pareto_flights(flights: List[Dict]) -> List[Dict]:
+    """
+    Keep only flight rows that are not beaten on both price and duration
+    """
+    front = []
+    best_duration = None
+
+    ranked = sorted(
+        ((row["record"]["price"], flight_duration(row), i) for i, row in enumerate(flights))
+    )
+
+    for _, duration, i in ranked:
+        row = flights[i]
+        if best_duration is None or duration < best_duration:
+            front.append(row)
+            best_duration = duration
+
+    return front
+
+
+def pareto_hotels(hotels: List[Dict]) -> List[Dict]:
+    """
+    Keep only hotels that are not beaten on both price per night and stars
+    """
+    front = []
+    best_stars = None
+
+    for hotel in sorted(hotels, key=lambda x: (x["price_per_night"], -x["stars"])):
+        if best_stars is None or hotel["stars"] > best_stars:
+            front.append(hotel)
+            best_stars = hotel["stars"]
+
+    return front
+
+
+def dominates(a: Dict, b: Dict) -> bool:
+    """
+    True if package a is at least as good as b on price, stars and
+    flight duration, and strictly better on one of them
+    """
+    no_worse = (
+        a["total_budget"] <= b["total_budget"]
+        and a["stars"] >= b["stars"]
+        and a["duration"] <= b["duration"]
+    )
+    better = (
+        a["total_budget"] < b["total_budget"]
+        or a["stars"] > b["stars"]
+        or a["duration"] < b["duration"]
+    )
+    return no_worse and better
+
+# Package search logic
+
+def search_packages(
+        source_city: str,
+        destination_city: str,
+        days: int,
+        max_budget: float,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None
+    ) -> List[Dict]:
+    """
+    Search flight + hotel packages that fit a total budget using parameters like:
+    - source_city (str)
+    - destination_city (str)
+    - days (int): trip length used for the hotel and misc costs
+    - max_budget: cap on the full trip budget
+    - start_date, end_date (yyyy-mm-dd) [optional]: departure window
+    Returns:
+    - the Pareto-optimal packages over total budget, hotel stars and
+      flight duration, cheapest first
+    """
+    if not source_city or not destination_city:
+        raise ValueError("source_city and destination_city are required")
+
+    if days < 1:
+        raise ValueError("days must be at least 1")
+
+    # Flights in the departure window
+
+    start = parse_date(start_date).date() if start_date else None
+    end = parse_date(end_date).date() if end_date else None
+
+    if start and end and start > end:
+        raise ValueError("Starting date cannot be after end date.")
+
+    flights = []
+    for row in route_rows(source_city.strip().lower(), destination_city.strip().lower()):
+        if start and row["departure_day"] < start.toordinal():
+            continue
+        if end and row["departure_day"] > end.toordinal():
+            continue
+        flights.append(row)
+
+    # Dominated flights or hotels can never be part of a Pareto-optimal
+    # package, so only the two fronts are combined
+
+    flights = pareto_flights(flights)
+    hotels = pareto_hotels(search_hotels(destination_city))
+
+    nights = max(1, days - 1)
+    misc_cost = 1500 * days
+
+    candidates = []
+    for row in flights:
+        flight = row["record"]
+        for hotel in hotels:
+            # Hotels are sorted by price, so every later one is over budget too
+            if flight["price"] + hotel["price_per_night"] * nights + misc_cost > max_budget:
+                break
+
+            budget = estimate_full_trip_budget(flight, hotel, days)
+            candidates.append({
+                "flight": flight,
+                "hotel": hotel,
+                "days": days,
+                "budget": budget,
+                "total_budget": budget["total_budget"],
+                "stars": hotel["stars"],
+                "duration": flight_duration(row)
+            })
+
+    # Final Pareto filter over all three objectives
+
+    candidates.sort(key=lambda x: (x["total_budget"], -x["stars"], x["duration"]))
+
+    results = []
+    for package in candidates:
+        if not any(dominates(kept, package) for kept in results):
+            results.append(package)
+
+    return results
+
+# Helper (for UI use later)
+
+def format_package(package: Dict) -> str:
+    """
+    Convert a package dictionary into readable string
+    """
+    return (
+        f"{format_flight(package['flight'])}\n"
+        f"{format_hotel(package['hotel'])}\n"
+        f"{package['days']} days | Total: ₹{package['total_budget']}"
+    )
+
+# Local test block
+
+if __name__ == "__main__":
+    test_results = search_packages(
+        source_city="Hyderabad",
+        destination_city="Delhi",
+        days=3,
+        max_budget=30000
+    )
+
+    print(f"Found {len(test_results)} packages:\n")
+
+    for package in test_results:
+        print(format_package(package))
+        print()
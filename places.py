@@ -1,6 +1,8 @@
-import json
 import os
 from typing import List,Dict,Optional
+from cache import get_cache, make_key, catalog_version
+from storage import get_backend
+from ingest import load_dataset, normalize_place, RECORD_SCHEMA_VERSION
 
 # Path handling
 
@@ -9,15 +11,19 @@ data_path = os.path.join(base_dir,'data','places.json')
 
 # Core data loader
 
+def load_place_rows() -> List[Dict]:
+    """
+    Load validated place rows from places.json
+    Bad records are quarantined by the ingest pipeline
+    """
+    return load_dataset(data_path, normalize_place)
+
+
 def load_places() -> List[Dict]:
     """
-    Load place data from places.json
+    Load validated place data from places.json
     """
-    if not os.path.exists(data_path):
-        raise FileNotFoundError(f'places.json not found at {data_path}')
-    
-    with open(data_path,'r',encoding='utf-8')as file:
-        return json.load(file)
+    return [row["record"] for row in load_place_rows()]
     
 # Places search logic
 
@@ -25,7 +31,8 @@ def search_places(
         city: str,
         place_type: Optional[str] = None,
         name: Optional[str] = None,
-        sort_by: str = "rating"
+        sort_by: str = "rating",
+        limit: Optional[int] = None
     ) -> List[Dict]:
     """
     Search places using parameters like:
@@ -33,49 +40,82 @@ def search_places(
     - type (str) [optional],
     - name (str) [optional],
     - sort_by: rating
+    - limit (int) [optional]
     Returns:
-    - a list of matching places dictionaries
+    - a list of matching places dictionaries (shared with the loaded
+      catalog, so do not modify them)
     """
-    # Load places data
-
-    places = load_places()
-
     # Normalise inputs
 
     city = city.strip().lower()
     name = name.strip().lower() if name else None
     place_type = place_type.strip().lower() if place_type else None
 
-    # Filter places
-
     if not city:
         raise ValueError("city is required")
 
+    if limit is not None and limit < 1:
+        raise ValueError("limit must be at least 1")
+
+    backend = get_backend()
+
+    # Cached results
+
+    cache = get_cache()
+    if cache:
+        version = backend.version() if backend else catalog_version(data_path)
+        key = make_key("search_places", RECORD_SCHEMA_VERSION, version, city, place_type, name, sort_by, limit)
+        cached = cache.get(key)
+        if cached is not None:
+            return cached
+
+    # Alternate storage backend
+
+    if backend:
+        results = backend.search_places(city, place_type, name, sort_by, limit)
+        if cache:
+            cache.set(key, results)
+        return results
+
+    # Load places data
+
+    rows = load_place_rows()
+
+    # Filter places
+
     results = []
-    for place in places:
+    for row in rows:
 
-        if place['city'].strip().lower() != city:
+        if row['city_key'] != city:
             continue
 
-        if name and name not in place['name'].strip().lower():
+        if name and name not in row['name_key']:
             continue
 
-        if place_type and place['type'].strip().lower() != place_type:
+        if place_type and row['type_key'] != place_type:
             continue
         
-        results.append(place)
+        results.append(row)
 
     # Sorting logic
 
     if sort_by == 'rating':
-        results.sort(key=lambda x:x['rating'],reverse=True)
+        results.sort(key=lambda x:x['record']['rating'],reverse=True)
 
     elif sort_by == 'name':
-        results.sort(key=lambda x:x['name'])
+        results.sort(key=lambda x:x['record']['name'])
 
     else:
         raise ValueError(f"invalid sort_by value: {sort_by}. Expected 'rating' or 'name'.")
-    
+
+    if limit:
+        results = results[:limit]
+
+    results = [row['record'] for row in results]
+
+    if cache:
+        cache.set(key, results)
+
     return results
 
 # Helper (for UI use later)
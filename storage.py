@@ -0,0 +1,380 @@
+import json
+import os
+import sqlite3
+import threading
+import uuid
+from urllib.request import pathname2url
+from abc import ABC, abstractmethod
+from typing import List,Dict,Optional
+from ingest import RECORD_SCHEMA_VERSION
+
+# Configuration
+
+# Set this to an SQLite file built with build_database to use it for searches
+db_path_env = "TRAVEL_PLANNER_DB"
+
+# Backend interface
+
+class CatalogBackend(ABC):
+    """
+    Storage backend for the search tools
+    Arguments arrive already normalised (stripped and lower-cased).
+    """
+
+    @abstractmethod
+    def version(self) -> str:
+        """
+        Changes whenever the stored catalog changes
+        """
+        ...
+
+    @abstractmethod
+    def search_flights(self, source_city: str, destination_city: str,
+            travel_date: Optional[str], sort_by: str,
+            limit: Optional[int]) -> List[Dict]:
+        ...
+
+    @abstractmethod
+    def route_flights(self, source_city: str, destination_city: str,
+            travel_date: Optional[str]) -> List[Dict]:
+        """
+        Flight rows (as built by ingest.normalize_flight) on one route
+        sorted by departure time, for round-trip pairing
+        """
+        ...
+
+    @abstractmethod
+    def search_hotels(self, city: str, name: Optional[str],
+            star: Optional[int], sort_by: str,
+            limit: Optional[int]) -> List[Dict]:
+        ...
+
+    @abstractmethod
+    def search_places(self, city: str, place_type: Optional[str],
+            name: Optional[str], sort_by: str,
+            limit: Optional[int]) -> List[Dict]:
+        ...
+
+# SQLite backend
+
+flight_order = {
+    "price": "price, id",
+    "duration": "duration, id"
+}
+
+hotel_order = {
+    "price": "price_per_night, id",
+    "stars": "stars DESC, id"
+}
+
+place_order = {
+    "rating": "rating DESC, id",
+    "name": "name, id"
+}
+
+schema = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS flights (
+    id INTEGER PRIMARY KEY,
+    from_key TEXT NOT NULL,
+    to_key TEXT NOT NULL,
+    departure_time TEXT NOT NULL,
+    departure_day INTEGER NOT NULL,
+    duration REAL NOT NULL,
+    price REAL NOT NULL,
+    record TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS flights_route_date ON flights (from_key, to_key, departure_time);
+
+CREATE TABLE IF NOT EXISTS hotels (
+    id INTEGER PRIMARY KEY,
+    city_key TEXT NOT NULL,
+    name_key TEXT NOT NULL,
+    stars INTEGER NOT NULL,
+    price_per_night REAL NOT NULL,
+    record TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS hotels_city_stars ON hotels (city_key, stars, price_per_night);
+
+CREATE TABLE IF NOT EXISTS places (
+    id INTEGER PRIMARY KEY,
+    city_key TEXT NOT NULL,
+    type_key TEXT NOT NULL,
+    name TEXT NOT NULL,
+    name_key TEXT NOT NULL,
+    rating REAL NOT NULL,
+    record TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS places_city_type_rating ON places (city_key, type_key, rating);
+"""
+
+
+class SQLiteBackend(CatalogBackend):
+    """
+    Catalog stored in indexed SQLite tables
+    Filtering, sorting and limits run in SQL, so the catalog never has to
+    fit in memory and many processes can read it at once.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.local = threading.local()
+
+    def connect(self) -> sqlite3.Connection:
+        """
+        One read connection per thread and process
+        No PRAGMAs here: readers may not have write access to the catalog.
+        """
+        conn = getattr(self.local, "conn", None)
+        # Connections must not be reused in a forked worker
+        if conn is None or self.local.pid != os.getpid():
+            folder = os.path.dirname(os.path.abspath(self.path))
+            if os.access(self.path, os.W_OK) and os.access(folder, os.W_OK):
+                conn = sqlite3.connect(self.path, timeout=30)
+            else:
+                # A read-only WAL catalog cannot create its -shm file, so
+                # open it as immutable (it cannot change under this process)
+                uri = "file:" + pathname2url(os.path.abspath(self.path)) + "?immutable=1"
+                conn = sqlite3.connect(uri, uri=True, timeout=30)
+            self.local.conn = conn
+            self.local.pid = os.getpid()
+            self.local.checked = False
+        return conn
+
+    def reader(self) -> sqlite3.Connection:
+        """
+        Connection for searches, refusing catalogs built for another record schema
+        """
+        conn = self.connect()
+        if not self.local.checked:
+            try:
+                row = conn.execute(
+                    "SELECT value FROM meta WHERE key = 'schema_version'"
+                ).fetchone()
+            except sqlite3.OperationalError as e:
+                if "no such table" not in str(e):
+                    raise
+                row = None
+
+            if row is None or row[0] != str(RECORD_SCHEMA_VERSION):
+                raise RuntimeError(
+                    f"{self.path} was not built for record schema {RECORD_SCHEMA_VERSION}. "
+                    "Rebuild it with build_database."
+                )
+            self.local.checked = True
+        return conn
+
+    def version(self) -> str:
+        """
+        Token written by the last import
+        The file's mtime is not enough: in WAL mode an import may only touch
+        the -wal file until the next checkpoint.
+        """
+        row = self.reader().execute(
+            "SELECT value FROM meta WHERE key = 'version'"
+        ).fetchone()
+        return row[0] if row else "empty"
+
+    def import_catalog(self, flights: List[Dict], hotels: List[Dict], places: List[Dict]) -> None:
+        """
+        Replace the stored catalog with the given rows
+        Rows must come from the row loaders, which add the normalised keys
+        """
+        conn = sqlite3.connect(self.path, timeout=30)
+        # WAL is stored in the file, so readers get it without setting it
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(schema)
+
+        with conn:
+            conn.execute("DELETE FROM flights")
+            conn.execute("DELETE FROM hotels")
+            conn.execute("DELETE FROM places")
+            conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('version', ?)",
+                (uuid.uuid4().hex,)
+            )
+            conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('schema_version', ?)",
+                (str(RECORD_SCHEMA_VERSION),)
+            )
+
+            conn.executemany(
+                "INSERT INTO flights (from_key, to_key, departure_time, departure_day, duration, price, record) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    (
+                        f["from_key"],
+                        f["to_key"],
+                        f["record"]["departure_time"],
+                        f["departure_day"],
+                        f["duration"],
+                        f["record"]["price"],
+                        json.dumps(f["record"])
+                    )
+                    for f in flights
+                )
+            )
+            conn.executemany(
+                "INSERT INTO hotels (city_key, name_key, stars, price_per_night, record) VALUES (?, ?, ?, ?, ?)",
+                (
+                    (
+                        h["city_key"],
+                        h["name_key"],
+                        h["record"]["stars"],
+                        h["record"]["price_per_night"],
+                        json.dumps(h["record"])
+                    )
+                    for h in hotels
+                )
+            )
+            conn.executemany(
+                "INSERT INTO places (city_key, type_key, name, name_key, rating, record) VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    (
+                        p["city_key"],
+                        p["type_key"],
+                        p["record"]["name"],
+                        p["name_key"],
+                        p["record"]["rating"],
+                        json.dumps(p["record"])
+                    )
+                    for p in places
+                )
+            )
+
+        conn.execute("ANALYZE")
+        conn.close()
+
+    def query(self, table: str, where: List[str], params: List, order: str, limit: Optional[int]) -> List[Dict]:
+        sql = f"SELECT record FROM {table} WHERE {' AND '.join(where)} ORDER BY {order}"
+        if limit:
+            sql += " LIMIT ?"
+            params = params + [limit]
+
+        rows = self.reader().execute(sql, params).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def search_flights(self, source_city, destination_city, travel_date, sort_by, limit):
+        if sort_by not in flight_order:
+            raise ValueError(f"Invalid sort_by value: {sort_by}. Expected 'price' or 'duration'.")
+
+        where = ["from_key = ?", "to_key = ?"]
+        params = [source_city, destination_city]
+
+        # Prefix match on the ISO timestamp as an index range
+        if travel_date:
+            where += ["departure_time >= ?", "departure_time < ?"]
+            params += [travel_date, travel_date + "\uffff"]
+
+        return self.query("flights", where, params, flight_order[sort_by], limit)
+
+    def route_flights(self, source_city, destination_city, travel_date):
+        where = ["from_key = ?", "to_key = ?"]
+        params = [source_city, destination_city]
+
+        if travel_date:
+            where += ["departure_time >= ?", "departure_time < ?"]
+            params += [travel_date, travel_date + "\uffff"]
+
+        # Served straight from the route+date index
+        sql = (
+            "SELECT departure_day, duration, record FROM flights "
+            f"WHERE {' AND '.join(where)} ORDER BY departure_time, id"
+        )
+
+        return [
+            {
+                "record": json.loads(record),
+                "from_key": source_city,
+                "to_key": destination_city,
+                "departure_day": departure_day,
+                "duration": duration
+            }
+            for departure_day, duration, record in self.reader().execute(sql, params)
+        ]
+
+    def search_hotels(self, city, name, star, sort_by, limit):
+        if sort_by not in hotel_order:
+            raise ValueError(f'invalid sort_by value {sort_by}. Expected "price_per_night" or "stars".')
+
+        where = ["city_key = ?"]
+        params = [city]
+
+        if star is not None:
+            where.append("stars = ?")
+            params.append(star)
+
+        if name:
+            where.append("instr(name_key, ?) > 0")
+            params.append(name)
+
+        return self.query("hotels", where, params, hotel_order[sort_by], limit)
+
+    def search_places(self, city, place_type, name, sort_by, limit):
+        if sort_by not in place_order:
+            raise ValueError(f"invalid sort_by value: {sort_by}. Expected 'rating' or 'name'.")
+
+        where = ["city_key = ?"]
+        params = [city]
+
+        if place_type:
+            where.append("type_key = ?")
+            params.append(place_type)
+
+        if name:
+            where.append("instr(name_key, ?) > 0")
+            params.append(name)
+
+        return self.query("places", where, params, place_order[sort_by], limit)
+
+
+def build_database(path: str) -> SQLiteBackend:
+    """
+    Import flights.json, hotels.json and places.json into an SQLite file
+    """
+    from flights import load_flight_rows
+    from hotels import load_hotel_rows
+    from places import load_place_rows
+
+    backend = SQLiteBackend(path)
+    backend.import_catalog(load_flight_rows(), load_hotel_rows(), load_place_rows())
+    return backend
+
+# Shared backend
+
+_backend = None
+_configured = False
+
+
+def set_backend(backend: Optional[CatalogBackend]) -> None:
+    """
+    Use the given backend for all search tools (None means the JSON files)
+    """
+    global _backend, _configured
+    _backend = backend
+    _configured = True
+
+
+def get_backend() -> Optional[CatalogBackend]:
+    """
+    Return the configured backend, created from the environment on first use
+    Returns None if searches should use the JSON files
+    """
+    global _backend, _configured
+    if not _configured:
+        path = os.environ.get(db_path_env)
+        if path:
+            _backend = SQLiteBackend(path)
+        _configured = True
+    return _backend
+
+# Local test block
+
+if __name__ == "__main__":
+    backend = build_database("travel.sqlite3")
+
+    for flight in backend.search_flights("hyderabad", "delhi", None, "price", 5):
+        print(flight)
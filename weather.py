@@ -1,5 +1,7 @@
+import os
 import requests
 from datetime import datetime, date, timedelta
+from cache import get_cache, make_key
 
 # City - Coordinates mapping
 CITY_COORDINATES = {
@@ -13,6 +15,15 @@ CITY_COORDINATES = {
     "jaipur": (26.9124, 75.7873)
 }
 
+# Forecast endpoint (can point at a local stub for load tests)
+OPEN_METEO_URL = os.environ.get("OPEN_METEO_URL", "https://api.open-meteo.com/v1/forecast")
+
+# Forecasts are reused for a few hours when the persistent cache is on
+WEATHER_CACHE_TTL = 3 * 60 * 60
+
+# Bump if the cached forecast format changes
+WEATHER_CACHE_VERSION = 1
+
 # HELPERS
 
 def parse_date(value) -> date:
@@ -78,10 +89,19 @@ def get_weather_forecast(city: str, start_date, end_date):
         "timezone": "auto"
     }
 
+    # CACHED FORECAST
+    cache = get_cache()
+    if cache:
+        # The endpoint is part of the key so stub forecasts never reach real users
+        key = make_key("weather", WEATHER_CACHE_VERSION, OPEN_METEO_URL, latitude, longitude, params["start_date"], params["end_date"])
+        cached = cache.get(key)
+        if cached is not None:
+            return cached
+
     # API CALL
     try:
         response = requests.get(
-            "https://api.open-meteo.com/v1/forecast",
+            OPEN_METEO_URL,
             params=params,
             timeout=10,
         )
@@ -98,11 +118,16 @@ def get_weather_forecast(city: str, start_date, end_date):
     dates = daily.get("time", [])
     temps = daily.get("temperature_2m_max", [])
 
-    return [
+    forecast = [
         {"date": d, "max_temp": t}
         for d, t in zip(dates, temps)
     ]
 
+    if cache:
+        cache.set(key, forecast, ttl=WEATHER_CACHE_TTL)
+
+    return forecast
+
 
 # LOCAL TEST
 